@@ -1,5 +1,8 @@
 import requests
-import json
+import json_utils
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, List, Optional
 import traceback
 
@@ -7,23 +10,60 @@ import traceback
 class APIClient:
     """Handles API requests and response processing"""
 
-    def __init__(self):
+    # Transient gateway errors retried on idempotent methods when retries are enabled
+    RETRY_STATUSES = (502, 503, 504)
+    RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+    def __init__(self, pool_connections: int = 32, pool_maxsize: int = 64, retries: int = 0):
         self.timeout = 15  # Default timeout in seconds
 
+        # Keep one session for the whole run so sockets (and TLS sessions) are
+        # reused across test cases instead of reconnecting for every request.
+        # requests already sends 'Accept-Encoding: gzip, deflate' and 'Connection: keep-alive'.
+        self.session = requests.Session()
+        # Pool connections only, not state: each test case sends just the cookies it injects
+        # (chain them with actions), as when every request was a standalone requests.request()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # Retrying is opt-in: a retried request hides the server error the test should report,
+        # and requests counts the retries and backoff in response.elapsed (the response time)
+        max_retries = 0  # requests' default: no retries
+        if retries > 0:
+            max_retries = Retry(
+                total=retries,
+                backoff_factor=0.1,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=self.RETRY_METHODS,
+                raise_on_status=False,  # Hand the last response to the validator instead of raising
+                respect_retry_after_header=False  # Keep run time bounded
+            )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=max_retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self) -> None:
+        """Release the pooled connections held by the session"""
+        self.session.close()
+
     def execute_request(self, method: str, url: str, params: Dict[str, str],
-                        headers: Dict[str, str], body: Any) -> Dict[str, Any]:
-        """Execute an API request and return processed response data"""
+                        headers: Dict[str, str], body: Any, parse_body: bool = True) -> Dict[str, Any]:
+        """
+        Execute an API request and return processed response data. With parse_body=False the
+        body is still downloaded (so the connection can be reused) but not decoded.
+        """
         try:
-            response = requests.request(
+            # stream=True defers the body download so _process_response reads it exactly once;
+            # leaving the with block hands the connection back to the pool
+            with self.session.request(
                 method=method,
                 url=url,
                 params=params,
                 headers=headers,
                 json=body,  # Use json=body for automatic Content-Type: application/json
-                timeout=self.timeout
-            )
-
-            return self._process_response(response)
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                return self._process_response(response, parse_body)
 
         except requests.exceptions.Timeout:
             raise requests.exceptions.Timeout("Request timed out")
@@ -33,42 +73,56 @@ class APIClient:
             traceback.print_exc()
             raise e
 
-    def _process_response(self, response) -> Dict[str, Any]:
+    def _process_response(self, response, parse_body: bool = True) -> Dict[str, Any]:
         """Process the API response into a standardized format"""
+        # Read the body once as bytes (network errors propagate as request errors); it is
+        # only decoded to text by the branches that need text
+        body = response.content
+
         # Parse response
         response_json = None
-        response_body_text = ""
         try:
-            response_body_text = response.text
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'application/json' in content_type:
-                response_json = response.json()
-            elif 'text/' in content_type or 'html' in content_type or 'xml' in content_type:
-                response_json = {"text": response.text}
-            else:
-                response_json = {
-                    "content_type": content_type,
-                    "content_preview": response.text[:100] + "..." if len(response.text) > 100 else response.text
-                }
-        except json.JSONDecodeError:
-            response_json = {"decoding_error": "Failed to decode JSON", "raw_response_text": response_body_text}
+            # Skip decoding when nothing (condition or action) will read the body
+            if parse_body:
+                content_type = response.headers.get('Content-Type', '').lower()
+                if 'application/json' in content_type:
+                    response_json = json_utils.loads(body)
+                elif 'text/' in content_type or 'html' in content_type or 'xml' in content_type:
+                    response_json = {"text": self._decode_body(body, response.encoding)}
+                else:
+                    preview = self._decode_body(body[:100], response.encoding)
+                    response_json = {
+                        "content_type": content_type,
+                        "content_preview": preview + "..." if len(body) > 100 else preview
+                    }
+        except json_utils.JSONDecodeError:
+            response_json = {"decoding_error": "Failed to decode JSON",
+                             "raw_response_text": self._decode_body(body, response.encoding)}
         except Exception as e:
-            response_json = {"processing_error": str(e), "raw_response_text": response_body_text}
+            response_json = {"processing_error": str(e),
+                             "raw_response_text": self._decode_body(body, response.encoding)}
 
         cookies = self._parse_cookies(response)
 
         return {
             "code": response.status_code,
             "body": response_json,
-            "headers": dict(response.headers),
+            # requests' case-insensitive mapping, returned as is instead of copied per request
+            "headers": response.headers,
             "cookies": cookies,
             "elapsed_time_ms": response.elapsed.total_seconds() * 1000
         }
 
+    @staticmethod
+    def _decode_body(body: bytes, encoding: Optional[str]) -> str:
+        """Decode body bytes with the response encoding, defaulting to UTF-8"""
+        try:
+            return body.decode(encoding or 'utf-8', errors='replace')
+        except LookupError:  # Unknown charset announced by the server
+            return body.decode('utf-8', errors='replace')
+
     def _parse_cookies(self, response) -> Dict[str, str]:
         """Extract cookies from response using requests' built-in cookiejar"""
-        cookies = {}
-        if response and hasattr(response, 'cookies'):
-            for cookie in response.cookies:
-                cookies[cookie.name] = cookie.value
-        return cookies
\ No newline at end of file
+        if response is None or not hasattr(response, 'cookies'):
+            return {}
+        return response.cookies.get_dict()
\ No newline at end of file
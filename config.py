@@ -1,34 +1,345 @@
+import hashlib
+import importlib.util
+import os
+import pickle
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse, fromstring
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+# Rust-backed reader, much faster than openpyxl on large workbooks. Falls back to
+# pandas' default engine when python-calamine is not installed.
+DEFAULT_EXCEL_ENGINE = "calamine"
+
+# Module each pandas Excel engine imports, to tell whether get_workbook would fall back
+_ENGINE_MODULES = {
+    'calamine': 'python_calamine', 'openpyxl': 'openpyxl', 'xlrd': 'xlrd', 'odf': 'odf', 'pyxlsb': 'pyxlsb',
+}
+
+# SpreadsheetML names used by the streaming environment-sheet reader
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_CELL_COLUMN_RE = re.compile(r'[A-Z]+')
+# Text that pandas' read_excel turns into NaN by default (its default na_values)
+_EXCEL_NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+# Directory holding pickled copies of parsed sheets, shared by all workbooks
+SHEET_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                               'apitest')
+# Most cached sheets kept; the least recently used ones are removed beyond this
+SHEET_CACHE_MAX_FILES = 200
 
 
 class ConfigLoader:
     """Handles loading environment variables and configuration from Excel"""
 
-    def __init__(self, xlsx_path: str):
+    def __init__(self, xlsx_path: str, engine: Optional[str] = None, cache_sheets: bool = True):
         self.xlsx_path = xlsx_path
+        self.engine = engine or DEFAULT_EXCEL_ENGINE
+        self.cache_sheets = cache_sheets
+        self._xl: Optional[pd.ExcelFile] = None
+        self._digest: Optional[str] = None  # sha256 of the workbook, computed on first cache use
+        self._engine_fallback = False  # Set when the requested engine failed to import
+
+    def get_workbook(self) -> pd.ExcelFile:
+        """
+        Return the workbook handle, opening it on first use. Every sheet read goes
+        through this single handle so the xlsx archive is only unzipped and parsed once.
+        """
+        if self._xl is None:
+            try:
+                self._xl = pd.ExcelFile(self.xlsx_path, engine=self.engine)
+            except ImportError as e:
+                print(f"Warning: Excel engine '{self.engine}' is unavailable ({e}); using pandas' default engine.")
+                self._engine_fallback = True
+                self._xl = pd.ExcelFile(self.xlsx_path)
+        return self._xl
+
+    def sheet_names(self) -> List[str]:
+        """
+        Return the names of all sheets in the workbook. Until the workbook is opened they are
+        read from xl/workbook.xml alone, so runs served by the sheet cache never open it.
+        """
+        if self._xl is None:
+            try:
+                with zipfile.ZipFile(self.xlsx_path) as archive:
+                    names = [name for name, path in self._sheet_entries(archive) if path is not None]
+                if names:
+                    return names
+            except (OSError, KeyError, ValueError, zipfile.BadZipFile, SyntaxError):
+                pass  # Not a plain xlsx (or missing); let the engine decide
+        return self.get_workbook().sheet_names
+
+    def read_sheet(self, sheet_name: Union[str, int], **kwargs: Any) -> pd.DataFrame:
+        """Read a single sheet from the already opened workbook"""
+        return pd.read_excel(self.get_workbook(), sheet_name=sheet_name, **kwargs)
+
+    def read_sheet_cached(self, sheet_name: str, tag: str, **kwargs: Any) -> pd.DataFrame:
+        """
+        Like read_sheet, but reuse a pickled copy of the result while the workbook file is
+        unchanged (same content, wherever it lives). tag must identify the read options,
+        since kwargs may hold callables.
+        """
+        cache_path = self._sheet_cache_path(sheet_name, tag) if self.cache_sheets else None
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as cache_file:
+                    df = pickle.load(cache_file)
+                os.utime(cache_path)  # Mark it recently used, see _prune_sheet_cache
+                return df
+            except FileNotFoundError:
+                pass
+            except Exception as e:  # Unreadable or from an incompatible version; rebuild it
+                print(f"Warning: Ignoring sheet cache '{cache_path}': {e}")
+
+        df = self.read_sheet(sheet_name, **kwargs)
+
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                # Write then rename, so a concurrent or interrupted run never sees half a file
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as cache_file:
+                    pickle.dump(df, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
+                self._prune_sheet_cache()
+            except OSError as e:
+                print(f"Warning: Could not write sheet cache '{cache_path}': {e}")
+        return df
+
+    @staticmethod
+    def _prune_sheet_cache() -> None:
+        """Remove the least recently used cached sheets beyond SHEET_CACHE_MAX_FILES"""
+        entries = []
+        with os.scandir(SHEET_CACHE_DIR) as scan:
+            for entry in scan:
+                if entry.name.endswith('.pkl'):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:  # Removed by a concurrent run
+                        pass
+        if len(entries) > SHEET_CACHE_MAX_FILES:
+            entries.sort()
+            for _, path in entries[:len(entries) - SHEET_CACHE_MAX_FILES]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _sheet_cache_path(self, sheet_name: str, tag: str) -> Optional[str]:
+        """
+        Cache file for a sheet, keyed by the sha256 of the workbook's bytes rather than its
+        mtime, so copies, checkouts and touched files still hit (None if it cannot be read)
+        """
+        if self._digest is None:
+            digest = hashlib.sha256()
+            try:
+                with open(self.xlsx_path, 'rb') as workbook:
+                    for block in iter(lambda: workbook.read(1 << 20), b''):
+                        digest.update(block)
+            except OSError:
+                return None
+            self._digest = digest.hexdigest()
+        key = "|".join([self._digest, self._resolved_engine(), sheet_name, tag, pd.__version__])
+        return os.path.join(SHEET_CACHE_DIR, hashlib.sha256(key.encode('utf-8')).hexdigest() + ".pkl")
+
+    def _resolved_engine(self) -> str:
+        """
+        The engine get_workbook uses (or would use, without opening the workbook): the requested
+        one, or 'default' when its module is missing and pandas picks the engine instead
+        """
+        if self._engine_fallback:
+            return 'default'
+        module = _ENGINE_MODULES.get(self.engine)
+        if module is not None and importlib.util.find_spec(module) is None:
+            return 'default'
+        return self.engine
+
+    def close(self) -> None:
+        """Close the workbook handle if it was opened"""
+        if self._xl is not None:
+            self._xl.close()
+            self._xl = None
 
     def load_environment(self) -> Dict[str, str]:
         """Load environment variables from the first sheet of the Excel file"""
         environment_vars = {}
         try:
-            # Use header=None to ensure it reads from the very first row
-            env_df = pd.read_excel(self.xlsx_path, sheet_name=0, header=None)
-            # Take only first two columns as key-value pairs
-            # Filter out rows where the first column (key) is NaN or empty after stripping
-            env_df = env_df.dropna(subset=[0])
-            env_df[0] = env_df[0].astype(str).str.strip()  # Ensure key is string and strip whitespace
-            env_df = env_df[env_df[0] != '']  # Remove rows where key is empty after strip
-
-            for _, row in env_df.iterrows():
-                key = row.iloc[0]
+            env_rows = self._read_env_rows()
+            if env_rows is not None:
+                for key, value in env_rows:
+                    key = key.strip() if key is not None else ''
+                    if key:  # Skip rows whose key is missing or empty after stripping
+                        environment_vars[key] = value if value is not None else ''
+            else:
+                # Use header=None to ensure it reads from the very first row; only the key/value
+                # columns are needed
+                env_df = self.read_sheet(0, header=None, usecols=[0, 1])
+                # Take only first two columns as key-value pairs
+                # Filter out rows where the first column (key) is NaN or empty after stripping
+                env_df = env_df.dropna(subset=[0])
+                keys = env_df[0].astype(str).str.strip()  # Ensure key is string and strip whitespace
                 # Handle potential NaN in the second column by treating it as empty string
-                value = str(row.iloc[1]) if pd.notna(row.iloc[1]) else ""
-                environment_vars[key] = value
+                values = env_df[1].astype(object).where(env_df[1].notna(), '').astype(str)
+                mask = keys != ''  # Remove rows where key is empty after strip
+
+                # Build the mapping column-wise instead of boxing every row into a Series
+                environment_vars = dict(zip(keys[mask].tolist(), values[mask].tolist()))
             print(f"Loaded {len(environment_vars)} environment variables")
         except FileNotFoundError:
             print(f"Error: Environment file not found at '{self.xlsx_path}' when loading environment.")
         except Exception as e:
             print(f"Error loading environment variables from sheet 1: {e}")
 
-        return environment_vars
\ No newline at end of file
+        return environment_vars
+
+    def _read_env_rows(self) -> Optional[List[Tuple[Optional[str], Optional[str]]]]:
+        """
+        Stream columns A and B of the first sheet straight from the xlsx archive, rendering
+        cells as text the way read_excel does (None for empty and NA cells). Returns None when
+        the file or a cell needs the full reader (not an xlsx, dates, booleans, errors, ...) or
+        a column holds no text, since pandas then reads it as floats ('1.0').
+        """
+        try:
+            with zipfile.ZipFile(self.xlsx_path) as archive:
+                sheet_path = self._first_sheet_path(archive)
+                if sheet_path is None:
+                    return None
+                rows = self._read_env_cells(archive, sheet_path)
+                if rows is None:
+                    return None
+
+                # Resolve shared strings; only the referenced entries are kept
+                wanted = {cell[1] for row in rows for cell in row if isinstance(cell, tuple)}
+                shared = self._read_shared_strings(archive, wanted) if wanted else {}
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile, SyntaxError):
+            return None
+
+        def resolve(cell):
+            if isinstance(cell, tuple):
+                cell = shared.get(cell[1])
+            return None if cell in _EXCEL_NA_VALUES else cell
+
+        rows = [[resolve(key), resolve(value)] for key, value in rows]
+        for column in (0, 1):
+            if not any(isinstance(row[column], str) for row in rows):
+                return None
+
+        def render(cell):
+            if isinstance(cell, float):
+                return str(int(cell)) if cell.is_integer() else str(cell)
+            return cell
+
+        return [(render(key), render(value)) for key, value in rows]
+
+    @staticmethod
+    def _first_sheet_path(archive: zipfile.ZipFile) -> Optional[str]:
+        """Return the archive path of the first sheet in workbook order, if it is a worksheet"""
+        entries = ConfigLoader._sheet_entries(archive)
+        return entries[0][1] if entries else None
+
+    @staticmethod
+    def _sheet_entries(archive: zipfile.ZipFile) -> List[Tuple[str, Optional[str]]]:
+        """
+        Return (name, archive path) for every sheet in workbook order. The path is None for
+        sheets that are not worksheets (chartsheets), which the Excel engines do not list.
+        """
+        rels = fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target', '') for rel in rels.iter(f'{_PKG_REL_NS}Relationship')}
+
+        entries = []
+        workbook = fromstring(archive.read('xl/workbook.xml'))
+        for sheet in workbook.iterfind(f'{_MAIN_NS}sheets/{_MAIN_NS}sheet'):
+            target = targets.get(sheet.get(f'{_REL_NS}id'))
+            path = None
+            if target is not None:
+                path = target.lstrip('/') if target.startswith('/') else posixpath.normpath('xl/' + target)
+                if '/worksheets/' not in f'/{path}':
+                    path = None
+            entries.append((sheet.get('name'), path))
+        return entries
+
+    @staticmethod
+    def _read_env_cells(archive: zipfile.ZipFile, sheet_path: str) -> Optional[List[List[Any]]]:
+        """
+        Return [A, B] per row of the sheet. A cell is text, a float, None, or ('s', index) for
+        a shared string; None is returned for the whole sheet if a cell type is unsupported.
+        """
+        rows = []
+        with archive.open(sheet_path) as sheet:
+            for _, element in iterparse(sheet):
+                if element.tag != f'{_MAIN_NS}row':
+                    continue
+                row = [None, None]
+                column = -1
+                for cell in element.iter(f'{_MAIN_NS}c'):
+                    reference = cell.get('r')
+                    if reference:
+                        letters = _CELL_COLUMN_RE.match(reference).group()
+                        column = 0
+                        for letter in letters:
+                            column = column * 26 + ord(letter) - ord('A') + 1
+                        column -= 1
+                    else:
+                        column += 1
+                    if column > 1:
+                        continue
+
+                    cell_type = cell.get('t', 'n')
+                    if cell_type == 'inlineStr':
+                        inline = cell.find(f'{_MAIN_NS}is')
+                        row[column] = ConfigLoader._rich_text(inline) if inline is not None else None
+                        continue
+
+                    value_element = cell.find(f'{_MAIN_NS}v')
+                    raw = value_element.text if value_element is not None else None
+                    if raw is None:
+                        continue  # Empty cell or formula without a cached value
+                    if cell_type == 's':
+                        row[column] = ('s', int(raw))
+                    elif cell_type == 'str':
+                        row[column] = raw
+                    elif cell_type == 'n' and cell.get('s', '0') == '0':
+                        row[column] = float(raw)
+                    else:
+                        # Styled number (maybe a date), boolean, error or ISO date cell; pandas
+                        # renders booleans as 'True' or '1' depending on the other cells
+                        return None
+                rows.append(row)
+                element.clear()
+        return rows
+
+    @staticmethod
+    def _read_shared_strings(archive: zipfile.ZipFile, wanted: set) -> Dict[int, str]:
+        """Return the shared strings at the wanted indices, stopping after the last one"""
+        strings = {}
+        last = max(wanted)
+        with archive.open('xl/sharedStrings.xml') as shared:
+            index = 0
+            for _, element in iterparse(shared):
+                if element.tag != f'{_MAIN_NS}si':
+                    continue
+                if index in wanted:
+                    strings[index] = ConfigLoader._rich_text(element)
+                element.clear()
+                if index >= last:
+                    break
+                index += 1
+        return strings
+
+    @staticmethod
+    def _rich_text(element) -> str:
+        """Text of an <si>/<is> element: its <t>, or the <t> of each rich-text run (no phonetics)"""
+        parts = []
+        for child in element:
+            if child.tag == f'{_MAIN_NS}t':
+                parts.append(child.text or '')
+            elif child.tag == f'{_MAIN_NS}r':
+                parts.extend(t.text or '' for t in child.iter(f'{_MAIN_NS}t'))
+        return ''.join(parts)
@@ -1,48 +1,100 @@
 import pandas as pd
-from typing import Dict, List, Any, Optional, Union
+import re
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple, Union
 import traceback
 import sys
 import os
 import statistics
+import threading
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import time
 
+import json_utils
 from config import ConfigLoader
 from api_client import APIClient
 from validators import Validator
-from parsers import RequestParser
+from parsers import RequestParser, isna
 from reporters import ConsoleReporter, PDFReporter
 
+# Columns read by execute_test_case and the validator; any other column in a test sheet is skipped
+TEST_COLUMNS = [
+    'test_case_name', 'verbose', 'api_path', 'method', 'query_param', 'inject_header', 'body',
+    'expect_response_code', 'expect_response_body', 'expect_response_header', 'action',
+]
+
+# Columns where '$name' variables are substituted, and the references/assignments that make
+# a row depend on earlier rows when test cases run concurrently
+VARIABLE_READ_COLUMNS = (
+    'api_path', 'query_param', 'inject_header', 'body', 'expect_response_body', 'expect_response_header',
+)
+VAR_REF_RE = re.compile(r'\$([a-zA-Z0-9_]+)')
+VAR_ASSIGN_RE = re.compile(r'\$([a-zA-Z0-9_]+)\s*=\s*result\.')
+
+# Environment variable giving the number of concurrent test cases when workers is not passed
+WORKERS_ENV_VAR = 'APITEST_WORKERS'
+
 
 class APITestFramework:
-    def __init__(self, xlsx_path: str, cycles: int = 1):
+    def __init__(self, xlsx_path: str, cycles: int = 1, workers: Optional[int] = None,
+                 engine: Optional[str] = None, results_path: Optional[str] = None, sheet_workers: int = 1,
+                 nrows: Optional[int] = None, skip_rows: int = 0, cache: bool = True, retries: int = 0):
         """Initialize the API test framework with the path to an Excel file"""
         self.xlsx_path = xlsx_path
         self.environment_vars = {}
         # self.results will store detailed results per test case (used for final summary)
         self.results: Dict[str, Dict[str, Any]] = {}
         self.cycle_results: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        self.verbose = False  # Initialize verbose flag
         self.cycles = max(1, cycles)  # Ensure at least 1 cycle
+        # Number of test cases of a sheet that may be in flight at the same time when
+        # run_tests(parallel=True) is used; otherwise rows run one by one
+        self.workers = max(1, workers if workers is not None else self._default_workers())
+        # Number of main test sheets run at the same time (1 runs them one after another)
+        self.sheet_workers = max(1, sheet_workers)
+        # Slice of data rows run from each main sheet (e.g. one shard per CI job): skip the
+        # first skip_rows rows below the header, then read at most nrows (None reads the rest)
+        self.nrows = nrows
+        self.skip_rows = max(0, skip_rows)
+        self.parallel = False  # Run the rows of a sheet concurrently; set per run by run_tests
+        self._lock = threading.Lock()  # Guards shared state written by worker threads
+        self._print_lock = threading.Lock()  # Keeps console lines from worker threads whole
+        # Optional JSON Lines file that receives every result as soon as it is recorded; line
+        # buffered, so each record reaches the file when it is written
+        self._results_sink = open(results_path, 'a', buffering=1, encoding='utf-8') if results_path else None
 
         # Load configuration and environment variables
-        self.config_loader = ConfigLoader(xlsx_path)
+        self.config_loader = ConfigLoader(xlsx_path, engine, cache_sheets=cache)
         self.environment_vars = self.config_loader.load_environment()
 
         # Initialize components
         self.parser = RequestParser(self.environment_vars)
-        self.api_client = APIClient()
-        self.validator = Validator(self.environment_vars)
+        self.api_client = APIClient(retries=retries)
+        self.validator = Validator(self.environment_vars, self.parser)
 
         # Initialize reporters
         self.console_reporter = ConsoleReporter()
         self.pdf_reporter = PDFReporter()
         self.sheet_cycle_results = {}
 
-    def execute_test_case(self, test_case: pd.Series, excel_sheet_name: str, cycle: int = 1) -> Dict[str, Any]:
-        """Execute a single test case and return detailed results."""
+    @staticmethod
+    def _default_workers() -> int:
+        """Worker count from APITEST_WORKERS, else min(32, 4 * CPU count) as network waits dominate"""
+        value = os.environ.get(WORKERS_ENV_VAR, '').strip()
+        if value:
+            try:
+                return int(value)
+            except ValueError:
+                print(f"Warning: Ignoring {WORKERS_ENV_VAR}='{value}', which is not a whole number.")
+        return min(32, 4 * (os.cpu_count() or 1))
+
+    def execute_test_case(self, test_case: Dict[str, Any], excel_sheet_name: str, cycle: int = 1,
+                          row_index: int = 0) -> Dict[str, Any]:
+        """
+        Execute a single test case and return detailed results.
+        test_case is one sheet row as a column -> value dict; row_index is its 0-based data row.
+        """
         test_name = str(test_case.get('test_case_name',
-                                      f'Unnamed Test Case Row {test_case.name + 2}'))
+                                      f'Unnamed Test Case Row {row_index + 2}'))
 
         # Store result by sheet::name for the global summary
         full_test_name = f"{excel_sheet_name}::{test_name}"
@@ -59,67 +111,72 @@ class APITestFramework:
 
         # Check if test case has api_path
         api_path_raw = test_case.get('api_path', None)
-        if pd.isna(api_path_raw) or str(api_path_raw).strip() == '':
-            print(f"\nSkipping test case '{test_name}' in sheet '{excel_sheet_name}': 'api_path' is missing or empty.")
+        if isna(api_path_raw) or str(api_path_raw).strip() == '':
+            self._log(f"\nSkipping test case '{test_name}' in sheet '{excel_sheet_name}': 'api_path' is missing or empty.")
             detailed_result["details"] = "'api_path' is missing or empty."
             # Store in cycle_results for the final report
-            self.cycle_results[full_test_name].append(detailed_result)
+            self._store_cycle_result(full_test_name, detailed_result)
             return detailed_result
 
-        # Check verbose flag specific to this test case row
-        verbose_row = False
-        if 'verbose' in test_case and not pd.isna(test_case['verbose']):
-            verbose_value = str(test_case['verbose']).lower().strip()
-            verbose_row = verbose_value in ('true', 'yes', '1')
-        self.verbose = verbose_row
+        # Check verbose flag specific to this test case row. Kept local rather than on
+        # self because test cases may run concurrently.
+        verbose = bool(test_case.get('verbose', False))
 
         try:
             # Parse request data
             api_path = self.parser.replace_env_vars(str(api_path_raw))
-            method = str(test_case.get('method', 'GET')).upper()
+            method = test_case.get('method', 'GET')
             query_params = self.parser.parse_dict_list(test_case.get('query_param', None))
             headers = self.parser.parse_headers(test_case.get('inject_header', None))
             body = self.parser.parse_json_body(test_case.get('body', None))
 
             # Debug output if verbose
-            if self.verbose:
-                print(f"  Request URL: {api_path}")
-                print(f"  Request Method: {method}")
-                if query_params: print(f"  Request Query Params: {query_params}")
-                if headers: print(f"  Request Headers: {headers}")
-                if body is not None:
-                    self.parser.print_body_preview(body)
-
-            # Execute API request
-            api_result_data = self.api_client.execute_request(method, api_path, query_params, headers, body)
+            if verbose:
+                with self._print_lock:
+                    print(f"  Request URL: {api_path}")
+                    print(f"  Request Method: {method}")
+                    if query_params: print(f"  Request Query Params: {query_params}")
+                    if headers: print(f"  Request Headers: {headers}")
+                    if body is not None:
+                        self.parser.print_body_preview(body)
+
+            # Execute API request; the response body is only decoded when a condition or
+            # action will read it, so a bare status-code check never parses an error page
+            parse_body = any(not isna(test_case.get(column, None)) for column in
+                             ('expect_response_body', 'expect_response_header', 'action'))
+            api_result_data = self.api_client.execute_request(method, api_path, query_params, headers, body,
+                                                              parse_body=parse_body)
 
             # Update result details
             detailed_result["actual_code"] = api_result_data["code"]
             detailed_result["elapsed_time_ms"] = api_result_data["elapsed_time_ms"]
 
-            # Validate response
-            validation_results = self.validator.validate_response(
-                test_case, api_result_data, self.verbose
-            )
+            # Validate response (verbose validation prints its steps, so keep them together)
+            if verbose:
+                with self._print_lock:
+                    validation_results = self.validator.validate_response(test_case, api_result_data, verbose)
+            else:
+                validation_results = self.validator.validate_response(test_case, api_result_data, verbose)
 
             detailed_result.update(validation_results)
 
             # Determine final test status
             if validation_results["test_passed_validations"]:
                 detailed_result["status"] = "Passed"
-                if cycle == 1 or self.verbose:  # Only print pass for first cycle unless verbose
-                    print(f"✅ Test case '{test_name}' PASSED (Cycle {cycle}/{self.cycles})")
+                if cycle == 1 or verbose:  # Only print pass for first cycle unless verbose
+                    self._log(f"✅ Test case '{test_name}' PASSED (Cycle {cycle}/{self.cycles})")
             else:
                 detailed_result["status"] = "Failed"
-                print(f"❌ Test case '{test_name}' FAILED (Cycle {cycle}/{self.cycles})")
+                self._log(f"❌ Test case '{test_name}' FAILED (Cycle {cycle}/{self.cycles})")
 
             # Execute actions
             action = test_case.get('action', None)
-            if pd.notna(action):
-                self.validator.execute_action(action, api_result_data)
+            if not isna(action):
+                with self._lock:
+                    self.validator.execute_action(action, api_result_data)
 
             # Store in cycle_results for the final report
-            self.cycle_results[full_test_name].append(detailed_result)
+            self._store_cycle_result(full_test_name, detailed_result)
             return detailed_result
 
         except Exception as e:
@@ -127,24 +184,169 @@ class APITestFramework:
             if hasattr(e, '__module__') and e.__module__ == 'requests.exceptions':
                 detailed_result["status"] = "Failed"
                 detailed_result["details"] += f"Request Error: {e}"
-                print(f"❌ Request Error executing test case '{test_name}' (Cycle {cycle}/{self.cycles}): {e}")
+                self._log(f"❌ Request Error executing test case '{test_name}' (Cycle {cycle}/{self.cycles}): {e}")
             else:
+                # Format the traceback once: always shown on the console, but only kept in the
+                # result details (table/PDF, truncated there anyway) for verbose test cases
+                formatted_traceback = traceback.format_exc()
                 detailed_result["status"] = "Error"
-                detailed_result["details"] += f"Unexpected Error: {e} - {traceback.format_exc()}"
-                print(f"❌ Unexpected Error executing test case '{test_name}' (Cycle {cycle}/{self.cycles}): {e}")
-                traceback.print_exc()
+                detailed_result["details"] += f"Unexpected Error: {e}"
+                if verbose:
+                    detailed_result["details"] += f" - {formatted_traceback}"
+                with self._print_lock:
+                    print(f"❌ Unexpected Error executing test case '{test_name}' (Cycle {cycle}/{self.cycles}): {e}")
+                    sys.stderr.write(formatted_traceback)
 
             # Store in cycle_results for the final report
-            self.cycle_results[full_test_name].append(detailed_result)
+            self._store_cycle_result(full_test_name, detailed_result)
             return detailed_result
-        finally:
-            self.verbose = False  # Reset verbose flag
 
-    def run_tests(self) -> Dict[str, Dict[str, Any]]:
-        """Run all test cases from the Excel file and print results as tables."""
+    def _log(self, message: str) -> None:
+        """Print a line without interleaving it with output from other worker threads"""
+        line = f"{message}\n"  # One write per line; print writes the text and the newline separately
+        with self._print_lock:
+            sys.stdout.write(line)
+
+    def _store_cycle_result(self, full_test_name: str, detailed_result: Dict[str, Any]) -> None:
+        """Record a test case result for the final report (safe to call from worker threads)"""
+        with self._lock:
+            self.cycle_results[full_test_name].append(detailed_result)
+            if self._results_sink is not None:
+                record = {"test": full_test_name, **detailed_result}
+                self._results_sink.write(json_utils.dumps(record, default=str) + "\n")
+
+    def _read_test_sheet(self, sheet_name: str, row_slice: bool = False) -> pd.DataFrame:
+        """
+        Read a setup/test sheet, keeping only TEST_COLUMNS and the rows that have a
+        test_case_name. Cells are read as text so pandas skips per-column type inference;
+        execute_test_case converts the values it needs.
+        With row_slice, only the nrows/skip_rows slice is parsed; the engine stops reading
+        after it, and the rows keep their position in the sheet.
+        """
+        tag = "test:" + ",".join(TEST_COLUMNS)
+        kwargs = {}
+        if row_slice and (self.nrows is not None or self.skip_rows):
+            tag += f":rows={self.skip_rows}+{self.nrows}"
+            kwargs = {'nrows': self.nrows, 'skiprows': range(1, self.skip_rows + 1)}  # Keep the header row
+
+        df = self.config_loader.read_sheet_cached(sheet_name, tag, usecols=lambda column: column in TEST_COLUMNS,
+                                                  dtype=str, **kwargs)
+        if kwargs:
+            df.index += self.skip_rows
+        # Drop unnamed (blank) rows with one vectorised mask instead of checking each row
+        return self._normalize_test_sheet(df[df['test_case_name'].notna()].copy())
+
+    @staticmethod
+    def _normalize_test_sheet(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalise the method, verbose and expect_response_code columns once per sheet, so
+        execute_test_case reads ready-made values instead of converting them on every row.
+        """
+        if 'method' in df:
+            df['method'] = df['method'].fillna('GET').str.upper()
+        if 'verbose' in df:
+            df['verbose'] = df['verbose'].str.lower().str.strip().isin(['true', 'yes', '1'])
+        if 'expect_response_code' in df:
+            codes = df['expect_response_code']
+            numeric = pd.to_numeric(codes, errors='coerce')
+            # Whole numbers become numeric; anything else keeps its raw text so the
+            # validator still reports it as an invalid expected code
+            valid = numeric.notna() & (numeric % 1 == 0)
+            df['expect_response_code'] = codes.astype(object).where(~valid, numeric)
+        return df
+
+    @staticmethod
+    def _sheet_records(df: pd.DataFrame) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Convert a sheet to (row_index, row dict) pairs once, so test cases are read with plain
+        dict lookups instead of building a pandas Series per row. Empty cells become None.
+        """
+        records = df.astype(object).where(df.notna(), None).to_dict(orient='records')
+        return list(zip(df.index.tolist(), records))
+
+    def _run_test_cases(self, test_cases: List[Tuple[int, Dict[str, Any]]], sheet_name: str,
+                        cycle: int) -> List[Dict[str, Any]]:
+        """
+        Execute the test cases of a sheet and return their results in sheet order: one by one,
+        or concurrently when running in parallel mode. Then a test case only waits for the
+        earlier rows it shares a variable with (see _row_dependencies); rows that touch no
+        common variable run side by side.
+        """
+        if not self.parallel or self.workers == 1:
+            return [self.execute_test_case(test_case, sheet_name, cycle, row_index)
+                    for row_index, test_case in test_cases]
+
+        dependencies = self._row_dependencies(test_cases)
+        futures: List[Future] = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for position, (row_index, test_case) in enumerate(test_cases):
+                # Earlier rows are always queued first, so the rows waited on are already
+                # running (or done) and the pool cannot deadlock
+                waits = [futures[earlier] for earlier in dependencies[position]]
+                futures.append(executor.submit(self._execute_after, waits, test_case, sheet_name, cycle,
+                                               row_index))
+
+        return [future.result() for future in futures]
+
+    def _execute_after(self, waits: List[Future], test_case: Dict[str, Any], sheet_name: str, cycle: int,
+                       row_index: int) -> Dict[str, Any]:
+        """Run a test case once the test cases it depends on have finished"""
+        if waits:
+            wait(waits)
+        return self.execute_test_case(test_case, sheet_name, cycle, row_index)
+
+    @staticmethod
+    def _row_variables(test_case: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+        """Return the variables a row reads ('$name' in its inputs) and writes ('$name = result...')"""
+        reads = set()
+        for column in VARIABLE_READ_COLUMNS:
+            value = test_case.get(column, None)
+            if isinstance(value, str) and '$' in value:
+                reads.update(VAR_REF_RE.findall(value))
+        action = test_case.get('action', None)
+        writes = set(VAR_ASSIGN_RE.findall(action)) if isinstance(action, str) else set()
+        return reads, writes
+
+    @classmethod
+    def _row_dependencies(cls, test_cases: List[Tuple[int, Dict[str, Any]]]) -> List[Set[int]]:
+        """For each row, the positions of the earlier rows it must wait for (see _dependencies)"""
+        return cls._dependencies([cls._row_variables(test_case) for _, test_case in test_cases])
+
+    @staticmethod
+    def _dependencies(accesses: List[Tuple[Set[str], Set[str]]]) -> List[Set[int]]:
+        """
+        Given (reads, writes) variable sets in run order, return for each entry the positions
+        of the earlier entries it must wait for: the last earlier writer of a variable it
+        reads or writes, and the readers since that write of a variable it writes.
+        """
+        last_writer: Dict[str, int] = {}
+        readers: Dict[str, List[int]] = defaultdict(list)
+        dependencies = []
+
+        for position, (reads, writes) in enumerate(accesses):
+            depends_on = {last_writer[name] for name in reads | writes if name in last_writer}
+            for name in writes:
+                depends_on.update(readers[name])
+            dependencies.append(depends_on)
+
+            for name in reads:
+                readers[name].append(position)
+            for name in writes:
+                last_writer[name] = position
+                readers[name] = []
+
+        return dependencies
+
+    def run_tests(self, parallel: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all test cases from the Excel file and print results as tables.
+        The rows of each main sheet run one by one, in sheet order. With parallel=True they
+        run on up to `workers` threads, ordered only by the variables they share.
+        """
+        self.parallel = parallel
         try:
-            xl = pd.ExcelFile(self.xlsx_path)
-            sheet_names = xl.sheet_names
+            sheet_names = self.config_loader.sheet_names()
         except FileNotFoundError:
             print(f"Error: Excel file not found at '{self.xlsx_path}'")
             return {}
@@ -163,96 +365,162 @@ class APITestFramework:
 
         if setup_sheet_name:
             print(f"\n=== Running Setup Sheet: {setup_sheet_name} ===")
+            # Only reading the sheet can fail here; execute_test_case reports its own errors
+            # as 'Error' results
             try:
-                setup_df = pd.read_excel(self.xlsx_path, sheet_name=setup_sheet_name)
-                setup_df = setup_df.dropna(subset=['test_case_name'])
-
-                # Always run setup only once regardless of cycles
-                for index, test_case in setup_df.iterrows():
-                    detailed_result = self.execute_test_case(test_case, setup_sheet_name, cycle=1)
-                    setup_results_list.append(detailed_result)
-
-                    if detailed_result["status"] in ["Failed", "Error"]:
-                        setup_success = False
-                        print(f"❌ Setup failed ('{test_case.get('test_case_name', 'Unnamed Setup Case')}'). "
-                              f"Remaining setup tests and all main tests will be skipped.")
-                        break
-
+                setup_cases = self._sheet_records(self._read_test_sheet(setup_sheet_name))
             except Exception as e:
                 print(f"Error processing Setup sheet '{setup_sheet_name}': {e}")
                 setup_success = False
-            finally:
-                # Print table for the setup sheet results
-                self.console_reporter.print_sheet_results_table(setup_sheet_name, setup_results_list)
+                setup_cases = []
+
+            # Always run setup only once regardless of cycles
+            for row_index, test_case in setup_cases:
+                detailed_result = self.execute_test_case(test_case, setup_sheet_name, cycle=1,
+                                                         row_index=row_index)
+                setup_results_list.append(detailed_result)
+
+                if detailed_result["status"] in ["Failed", "Error"]:
+                    setup_success = False
+                    print(f"❌ Setup failed ('{test_case.get('test_case_name', 'Unnamed Setup Case')}'). "
+                          f"Remaining setup tests and all main tests will be skipped.")
+                    break
+
+            # Print table for the setup sheet results
+            self.console_reporter.print_sheet_results_table(setup_sheet_name, setup_results_list)
 
         # --- Execute Main Test Sheets ---
         if setup_success:
-            for sheet_name in sheet_names[2:]:  # Start from the 3rd sheet
-                print(f"\n=== Running Test Sheet: {sheet_name} ===")
-
-                # Store results by cycle for this sheet
-                cycle_results_by_cycle = defaultdict(list)
-                sheet_processing_error = None  # Track errors loading/processing sheet
-
-                try:
-                    test_df = pd.read_excel(self.xlsx_path, sheet_name=sheet_name)
-                    test_df = test_df.dropna(subset=['test_case_name'])
-
-                    # Run each cycle
-                    for cycle in range(1, self.cycles + 1):
-                        if self.cycles > 1:
-                            print(f"\n--- Cycle {cycle}/{self.cycles} ---")
-
-                        sheet_has_failures = False
-                        cycle_results_list = []  # Results for this cycle
-
-                        for index, test_case in test_df.iterrows():
-                            # Small pause between cycles to avoid rate limiting
-                            if cycle > 1 and index == 0:
-                                time.sleep(0.5)
-
-                            detailed_result = self.execute_test_case(test_case, sheet_name, cycle)
-                            cycle_results_list.append(detailed_result)
-                            cycle_results_by_cycle[cycle].append(detailed_result)
-
-                            if detailed_result["status"] in ["Failed", "Error"]:
-                                sheet_has_failures = True
-
-                        # Print table for individual cycles
-                        self.console_reporter.print_cycle_results(
-                            sheet_name,
-                            cycle,
-                            cycle_results_list
-                        )
-
-                    # After all cycles, check if there were failures
-                    if not sheet_has_failures and not test_df.empty:
-                        print(f"✅ All executed tests in sheet '{sheet_name}' PASSED")
-                    elif test_df.empty:
-                        print(f"ℹ️ No test cases found with 'test_case_name' in sheet '{sheet_name}'")
-
-                except Exception as e:
-                    print(f"Error processing Test sheet '{sheet_name}': {e}")
-                    sheet_processing_error = e
-
-                finally:
-                    # Generate combined statistics for each test case across all cycles
-                    if self.cycles > 1:
-                        self._aggregate_cycle_results(sheet_name)
-                        # Print table for the combined cycles
-                        self.console_reporter.print_combined_sheet_results(sheet_name, self.results)
-
-                        # Store cycle results for PDF reporting
-                        self.sheet_cycle_results[sheet_name] = cycle_results_by_cycle
-
-                    if sheet_processing_error:
-                        print(f"‼️ Processing of sheet '{sheet_name}' encountered an error: {sheet_processing_error}")
+            main_sheet_names = sheet_names[2:]  # Start from the 3rd sheet
+            if self.sheet_workers > 1 and len(main_sheet_names) > 1:
+                sheet_cycle_results = self._run_sheets_concurrently(main_sheet_names)
+            else:
+                sheet_cycle_results = [self._run_sheet(sheet_name,
+                                                       lambda name=sheet_name: self._read_test_sheet(name, True))
+                                       for sheet_name in main_sheet_names]
+
+            if self.cycles > 1:
+                # Store cycle results for PDF reporting, in sheet order
+                for sheet_name, cycle_results_by_cycle in zip(main_sheet_names, sheet_cycle_results):
+                    self.sheet_cycle_results[sheet_name] = cycle_results_by_cycle
 
         # --- Print Console Summary ---
         self.console_reporter.print_summary(self.results)
 
         return self.results
 
+    def _run_sheets_concurrently(self, sheet_names: List[str]) -> List[Dict[int, List[Dict[str, Any]]]]:
+        """
+        Run main sheets side by side (up to sheet_workers at a time). Sheets share the variables
+        set by actions, so a sheet waits for the earlier sheets it shares a variable with, as
+        rows do within a sheet. The sheets are read up front, on this thread, because the
+        workbook handle is not thread-safe.
+        """
+        loaded: List[Union[pd.DataFrame, Exception]] = []
+        for sheet_name in sheet_names:
+            try:
+                loaded.append(self._read_test_sheet(sheet_name, row_slice=True))
+            except Exception as e:  # Reported by _run_sheet like any other sheet error
+                loaded.append(e)
+
+        def loader(frame: Union[pd.DataFrame, Exception]) -> Callable[[], pd.DataFrame]:
+            def load() -> pd.DataFrame:
+                if isinstance(frame, Exception):
+                    raise frame
+                return frame
+            return load
+
+        accesses = []
+        for frame in loaded:
+            reads, writes = set(), set()
+            if not isinstance(frame, Exception):
+                for _, test_case in self._sheet_records(frame):
+                    row_reads, row_writes = self._row_variables(test_case)
+                    reads |= row_reads
+                    writes |= row_writes
+            accesses.append((reads, writes))
+        dependencies = self._dependencies(accesses)
+
+        futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=self.sheet_workers) as executor:
+            for position, (sheet_name, frame) in enumerate(zip(sheet_names, loaded)):
+                waits = [futures[earlier] for earlier in dependencies[position]]
+                futures.append(executor.submit(self._run_sheet_after, waits, sheet_name, loader(frame)))
+        return [future.result() for future in futures]
+
+    def _run_sheet_after(self, waits: List[Future], sheet_name: str,
+                         load: Callable[[], pd.DataFrame]) -> Dict[int, List[Dict[str, Any]]]:
+        """Run a sheet once the sheets it depends on have finished"""
+        if waits:
+            wait(waits)
+        return self._run_sheet(sheet_name, load)
+
+    def _run_sheet(self, sheet_name: str, load: Callable[[], pd.DataFrame]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Run every cycle of a main test sheet, print its tables and return its results by cycle.
+        load returns the sheet's DataFrame; errors raised by it are reported like run errors.
+        """
+        self._log(f"\n=== Running Test Sheet: {sheet_name} ===")
+
+        # Store results by cycle for this sheet
+        cycle_results_by_cycle = defaultdict(list)
+        sheet_processing_error = None  # Track errors loading/processing sheet
+
+        try:
+            test_df = load()
+
+            test_cases = self._sheet_records(test_df)
+
+            # Run each cycle
+            for cycle in range(1, self.cycles + 1):
+                if self.cycles > 1:
+                    self._log(f"\n--- Cycle {cycle}/{self.cycles} ---")
+
+                # Small pause between cycles to avoid rate limiting
+                if cycle > 1:
+                    time.sleep(0.5)
+
+                cycle_results_list = self._run_test_cases(test_cases, sheet_name, cycle)
+                cycle_results_by_cycle[cycle].extend(cycle_results_list)
+
+                sheet_has_failures = any(
+                    detailed_result["status"] in ["Failed", "Error"] for detailed_result in cycle_results_list
+                )
+
+                # Print table for individual cycles
+                with self._print_lock:
+                    self.console_reporter.print_cycle_results(
+                        sheet_name,
+                        cycle,
+                        cycle_results_list
+                    )
+
+            # After all cycles, check if there were failures
+            if not sheet_has_failures and not test_df.empty:
+                self._log(f"✅ All executed tests in sheet '{sheet_name}' PASSED")
+            elif test_df.empty:
+                self._log(f"ℹ️ No test cases found with 'test_case_name' in sheet '{sheet_name}'")
+
+        except Exception as e:
+            self._log(f"Error processing Test sheet '{sheet_name}': {e}")
+            sheet_processing_error = e
+
+        finally:
+            # Generate combined statistics for each test case across all cycles
+            if self.cycles > 1:
+                with self._lock:
+                    self._aggregate_cycle_results(sheet_name)
+                    sheet_results = {key: value for key, value in self.results.items()
+                                     if key.startswith(f"{sheet_name}::")}
+                # Print table for the combined cycles
+                with self._print_lock:
+                    self.console_reporter.print_combined_sheet_results(sheet_name, sheet_results)
+
+            if sheet_processing_error:
+                self._log(f"‼️ Processing of sheet '{sheet_name}' encountered an error: {sheet_processing_error}")
+
+        return cycle_results_by_cycle
+
     def _aggregate_cycle_results(self, sheet_name: str) -> None:
         """
         Aggregate results from multiple cycles for tests in the specified sheet.
@@ -349,6 +617,20 @@ class APITestFramework:
             # Store in the main results dictionary
             self.results[full_test_name] = aggregated_result
 
+    def close(self) -> None:
+        """Release the workbook handle and network resources held by the API client"""
+        self.config_loader.close()
+        self.api_client.close()
+        if self._results_sink is not None:
+            self._results_sink.close()
+            self._results_sink = None
+
+    def __enter__(self) -> 'APITestFramework':
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.close()
+
     def generate_pdf_report(self, output_path: str = "test_report.pdf"):
         """Generates a PDF report of the test results"""
         self.pdf_reporter.generate_report(
@@ -0,0 +1,40 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+# orjson parses and serializes several times faster than the stdlib; it is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only need this one
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or UTF-8 bytes"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the stdlib (NaN/Infinity, non UTF-8 bytes), so
+            # let json have the final say before reporting a decode error
+            pass
+    return json.loads(data)
+
+
+def dumps(value: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serialize a value to a JSON string (non-ASCII characters are kept as is). default converts
+    objects that are not natively serializable, as in json.dumps.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(value, default=default, option=option).decode()
+        except TypeError:
+            pass  # A type orjson does not handle; the stdlib may still cope with it
+    # Same layout as orjson (compact, or two-space indent), whichever library serialized it
+    if indent:
+        return json.dumps(value, indent=2, ensure_ascii=False, default=default)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=default)
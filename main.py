@@ -1,11 +1,16 @@
 import argparse
-import template_generator
-from framework import APITestFramework
+import os
 
 
-def run_example(test_file, report_name='report', cycles=1):
-    test_framework = APITestFramework(test_file, cycles=cycles)
-    test_framework.run_tests()
+def run_example(test_file, report_name='report', cycles=1, workers=None, engine=None, results_path=None,
+                sheet_workers=1, nrows=None, skip_rows=0, cache=True, parallel=False, retries=0):
+    # Imported here so --help and argument errors don't pay for importing pandas and requests
+    from framework import APITestFramework
+
+    with APITestFramework(test_file, cycles=cycles, workers=workers, engine=engine,
+                          results_path=results_path, sheet_workers=sheet_workers,
+                          nrows=nrows, skip_rows=skip_rows, cache=cache, retries=retries) as test_framework:
+        test_framework.run_tests(parallel=parallel)
     test_framework.generate_pdf_report(f"{report_name}.pdf")
 
 if __name__ == "__main__":
@@ -20,10 +25,42 @@ if __name__ == "__main__":
     parser.add_argument("--generate-template", action="store_true", help="Only generate a test template Excel file and exit")
     parser.add_argument('--cycle', type=int, default=1,
                         help='Number of cycles to run each test sheet. Provides statistical analysis when > 1.')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run the test cases of a main sheet concurrently. Rows that share a $variable '
+                             'still run in sheet order, but rows that depend on each other in other ways '
+                             '(e.g. create, then read, then delete the same resource) may overlap.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maximum number of test cases run concurrently within a sheet with --parallel '
+                             '(default: the APITEST_WORKERS environment variable, else min(32, 4 * CPU count))')
+    parser.add_argument('--sheet-workers', type=int, default=1,
+                        help='Number of main test sheets run at the same time (default: 1). Sheets that '
+                             'share variables set by actions still run in sheet order.')
+    parser.add_argument('--engine', default=None,
+                        help='pandas Excel engine used to read the test file, e.g. calamine or openpyxl '
+                             '(default: calamine, falling back to pandas\' default when not installed)')
+    parser.add_argument('--results-jsonl', default=None, metavar='PATH',
+                        help='Append every test case result to this JSON Lines file as soon as it completes')
+    parser.add_argument('--nrows', type=int, default=None,
+                        help='Only run this many rows of each main test sheet (the setup sheet always runs in full)')
+    parser.add_argument('--skip-rows', type=int, default=0,
+                        help='Skip this many rows below the header of each main test sheet, e.g. to split a '
+                             'large sheet across CI jobs together with --nrows')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always parse the test sheets instead of reusing the copies cached in '
+                             '~/.cache/apitest from earlier runs of the same workbook')
+    parser.add_argument('--retries', type=int, default=0,
+                        help='Retry GET/HEAD/OPTIONS requests answered with 502, 503 or 504 up to this many '
+                             'times (default: 0). Retried requests report the combined time, including backoff.')
     args = parser.parse_args()
 
     if args.generate_template:
+        import template_generator
+
         template_generator.create_template_xlsx(args.test_file)
         print(f"Template generated: {args.test_file}")
+    elif not os.path.isfile(args.test_file):
+        parser.error(f"test file not found: '{args.test_file}'")
     else:
-        run_example(args.test_file, args.report_name, args.cycle)
\ No newline at end of file
+        run_example(args.test_file, args.report_name, args.cycle, args.workers, args.engine, args.results_jsonl,
+                    args.sheet_workers, args.nrows, args.skip_rows, not args.no_cache, args.parallel,
+                    args.retries)
\ No newline at end of file
@@ -1,92 +1,178 @@
+import ast
 import re
-import json
+import threading
+from functools import lru_cache
 import pandas as pd
-from typing import Dict, List, Any, Union, Optional
-import json
+from typing import Dict, List, Any, Pattern, Tuple, Union, Optional
+import json_utils
+
+
+def isna(value: Any) -> bool:
+    """
+    Scalar-only stand-in for pd.isna for sheet cells (None, NaN or pd.NA), without
+    pandas' array/scalar dispatch on every field of every test case.
+    """
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+
+class _JSONNames(ast.NodeTransformer):
+    """Turn the JSON literals true/false/null into constants, for Python-literal cells that use them"""
+
+    _VALUES = {'true': True, 'false': False, 'null': None}
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in self._VALUES:
+            return ast.copy_location(ast.Constant(self._VALUES[node.id]), node)
+        return node
 
 
 class RequestParser:
     """Handles parsing of request components and variable replacements"""
 
+    # Compiled once instead of on every call; these run for every field of every test case
+    _ENV_NAME_RE = re.compile(r'[a-zA-Z0-9_]+')
+    _BRACED_ITEM_RE = re.compile(r'\{(.*?)\}')
+
     def __init__(self, environment_vars: Dict[str, str]):
         self.environment_vars = environment_vars
+        # Alternation of the known variable names, rebuilt when the set of names changes.
+        # Stored with the names version it was built for, as one tuple, so threads
+        # substituting concurrently never pair a new version with an old pattern.
+        self._env_version = 0
+        self._env_re: Tuple[int, Optional[Pattern[str]]] = (-1, None)
+        self._env_re_lock = threading.Lock()
+
+    def mark_env_changed(self) -> None:
+        """Signal that variable names were added (after adding them), so the pattern is rebuilt"""
+        self._env_version += 1
+
+    def _get_env_re(self) -> Optional[Pattern[str]]:
+        """Return the pattern matching '$name' for every known variable (None when there are none)"""
+        version = self._env_version
+        built_version, env_re = self._env_re
+        if built_version == version:
+            return env_re
+
+        with self._env_re_lock:
+            built_version, env_re = self._env_re
+            if built_version != version:
+                # Longest names first, and no trailing name character, so '$ab' never matches
+                # variable 'a' and '$abc' stays untouched when only 'a'/'ab' exist
+                names = sorted((name for name in list(self.environment_vars) if self._ENV_NAME_RE.fullmatch(name)),
+                               key=len, reverse=True)
+                env_re = re.compile(
+                    r'\$(' + '|'.join(map(re.escape, names)) + r')(?![a-zA-Z0-9_])') if names else None
+                self._env_re = (version, env_re)
+            return env_re
 
     def replace_env_vars(self, text: Union[str, Any]) -> Union[str, Any]:
         """Replace environment variables in text with their values"""
         if not isinstance(text, str):
             return text
+        if '$' not in text:  # Most fields hold no variables; skip the regex scan
+            return text
 
-        pattern = r'\$([a-zA-Z0-9_]+)'
-
-        def replace_var(match):
-            var_name = match.group(1)
-            if var_name in self.environment_vars:
-                return self.environment_vars[var_name]
-            else:
-                return match.group(0)  # Return original string if not found
+        env_re = self._get_env_re()
+        if env_re is None:
+            return text
 
-        return re.sub(pattern, replace_var, text)
+        # Only known names match, so the lookup cannot miss and unknown '$name' stays as is
+        environment_vars = self.environment_vars
+        return env_re.sub(lambda match: environment_vars[match.group(1)], text)
 
     def parse_dict_list(self, text: str) -> Dict[str, str]:
-        """Parse a string representation of a list of dictionaries"""
-        if not text or pd.isna(text):
+        """
+        Parse a string representation of a list of dictionaries into a single dict.
+        Accepts a Python-literal or JSON list of dicts ("[{'Accept': 'text/plain'}]", also
+        with true/false/null values), a single dict, or the pair notation
+        "[{'key', 'value'}, ...]". Items that are not dicts are ignored.
+        """
+        if isna(text) or not text:
             return {}
 
-        text = self.replace_env_vars(str(text))  # Ensure text is a string
+        text = self.replace_env_vars(str(text)).strip()  # Ensure text is a string
+        # Copy, so callers never mutate the cached dict
+        return dict(self._parse_dict_text(text))
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _parse_dict_text(text: str) -> Dict[str, str]:
+        """
+        Parse already substituted dict-list text. Cached by that text, so header and query
+        cells repeated across rows and cycles are decoded once; a variable change yields
+        different text and therefore a fresh parse.
+        """
         result_dict = {}
 
         try:
-            # Attempt to parse as JSON first
-            json_string = text.strip().replace("'", '"')
-            parsed_list = json.loads(json_string)
-
-            # Convert list of dictionaries to a single dict
-            if isinstance(parsed_list, list):
-                for item in parsed_list:
+            parsed = RequestParser._parse_literal(text)
+
+            # Convert list of dictionaries to a single dict, ignoring items that are not dicts.
+            # A list holding sets is the pair notation and is left to the fallback below.
+            if isinstance(parsed, dict):
+                return parsed
+            if isinstance(parsed, list) and not any(isinstance(item, set) for item in parsed):
+                for item in parsed:
                     if isinstance(item, dict):
                         result_dict.update(item)
-            elif isinstance(parsed_list, dict):
-                result_dict = parsed_list
-
-            return result_dict
-
-        except json.JSONDecodeError:
-            # Fallback to a simpler parsing if JSON fails
-            try:
-                # Attempt to handle [{'key', 'value'}, {'key2', 'value2'}] or [{'key': 'value'}]
-                items = re.findall(r'\{(.*?)\}', text)
-                for item in items:
-                    item = item.strip()
-                    if not item: continue
+                return result_dict
+            if parsed is not None and not isinstance(parsed, (list, set)):
+                return result_dict  # A scalar holds no key/value pairs
+        except Exception as e:
+            print(f"Unexpected error parsing dictionary list '{text[:100]}...': {e}")
+            return {}
 
-                    parts = [p.strip("'\" ") for p in item.split(',', 1)]
+        # Fallback for the pair notation, which ast parses as (a list of) sets rather than
+        # dicts, and for text neither parser accepts, such as unquoted keys
+        try:
+            # Attempt to handle [{'key', 'value'}, {'key2', 'value2'}] or [{'key': 'value'}]
+            items = RequestParser._BRACED_ITEM_RE.findall(text)
+            for item in items:
+                item = item.strip()
+                if not item: continue
+
+                parts = [p.strip("'\" ") for p in item.split(',', 1)]
+                if len(parts) == 2:
+                    key, value = parts
+                    result_dict[key] = value
+                elif ':' in item:
+                    parts = [p.strip("'\" ") for p in item.split(':', 1)]
                     if len(parts) == 2:
                         key, value = parts
                         result_dict[key] = value
-                    elif ':' in item:
-                        parts = [p.strip("'\" ") for p in item.split(':', 1)]
-                        if len(parts) == 2:
-                            key, value = parts
-                            result_dict[key] = value
 
-                return result_dict
-            except Exception as e_fallback:
-                print(f"Error during fallback parsing dictionary list '{text[:100]}...': {e_fallback}")
-                return {}
-        except Exception as e:
-            print(f"Unexpected error parsing dictionary list '{text[:100]}...': {e}")
+            return result_dict
+        except Exception as e_fallback:
+            print(f"Error during fallback parsing dictionary list '{text[:100]}...': {e_fallback}")
             return {}
 
+    @staticmethod
+    def _parse_literal(text: str) -> Any:
+        """
+        Parse strict JSON first (the preferred cell format, decoded in C by orjson), falling
+        back to Python-literal syntax with ast.literal_eval for single-quoted dicts. The
+        literal parse also accepts true/false/null, as in "{'a': true, 'b': null}".
+        Returns None when the text is neither.
+        """
+        try:
+            return json_utils.loads(text)
+        except json_utils.JSONDecodeError:
+            pass
+        try:
+            return ast.literal_eval(_JSONNames().visit(ast.parse(text, mode='eval')))
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            return None
+
     def parse_json_body(self, body_text: str) -> Any:
         """Parse the body text as JSON"""
-        if not body_text or pd.isna(body_text):
+        if isna(body_text) or not body_text:
             return None
 
         body_text = self.replace_env_vars(str(body_text))  # Ensure text is a string
 
         try:
-            return json.loads(body_text)
-        except json.JSONDecodeError:
+            return json_utils.loads(body_text)
+        except json_utils.JSONDecodeError:
             return None
         except Exception as e:
             print(f"Unexpected error parsing JSON body '{body_text[:100]}...': {e}")
@@ -94,7 +180,7 @@ class RequestParser:
 
     def parse_headers(self, header_text: str) -> Dict[str, str]:
         """Parse headers from various formats into a dictionary"""
-        if not header_text or pd.isna(header_text):
+        if isna(header_text) or not header_text:
             return {}
 
         header_text = self.replace_env_vars(str(header_text))
@@ -105,5 +191,5 @@ class RequestParser:
     def print_body_preview(self, body: Any) -> None:
         """Print a preview of the request body"""
         if body is not None:
-            body_print = json.dumps(body, indent=2, ensure_ascii=False)
+            body_print = json_utils.dumps(body, indent=True)
             print(f"  Request Body: {body_print[:500]}{'...' if len(body_print) > 500 else ''}")
\ No newline at end of file
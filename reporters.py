@@ -1,91 +1,78 @@
-from collections import OrderedDict, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 from typing import Dict, List, Any
 import pandas as pd
 import datetime
+import sys
 
-from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+# reportlab is imported by the PDFReporter methods that draw, so importing this module (and
+# running tests with ConsoleReporter) does not pay for loading it until a report is generated
 
 
 class ConsoleReporter:
     """Handles console reporting of test results"""
 
+    # Columns of the per-sheet/per-cycle results tables and their keys in the result dictionary
+    RESULT_COLUMNS = OrderedDict([
+        ("Test Name", "test_name"),
+        ("Response Time", "elapsed_time_ms"),
+        ("Status", "status"),
+        ("Code", "actual_code"),
+        ("Body Val", "body_validation"),
+        ("Header Val", "header_validation"),
+        ("Details", "details"),
+    ])
+    # Maximum width for the 'Details' column to keep the table manageable
+    MAX_DETAILS_WIDTH = 80
+
     def print_sheet_results_table(self, sheet_name: str, results_list: List[Dict[str, Any]]) -> None:
         """Prints the results for a single sheet in a formatted table, including Response Time."""
         if not results_list:
             print(f"\nNo test cases executed in sheet '{sheet_name}'.")
             return
 
-        print(f"\n--- Results for Sheet: {sheet_name} ---")
+        self._write_lines([f"\n--- Results for Sheet: {sheet_name} ---"] + self._format_results_table(results_list))
 
-        # Define columns and their corresponding keys in the result dictionary
-        columns = OrderedDict([
-            ("Test Name", "test_name"),
-            ("Response Time", "elapsed_time_ms"),
-            ("Status", "status"),
-            ("Code", "actual_code"),
-            ("Body Val", "body_validation"),
-            ("Header Val", "header_validation"),
-            ("Details", "details"),
-        ])
+    def _format_results_table(self, results_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Format results as table lines. Each cell is converted to text once, and the same
+        strings size the columns and fill the rows.
+        """
+        columns = self.RESULT_COLUMNS
+        max_details_width = self.MAX_DETAILS_WIDTH
 
-        # Define maximum width for the 'Details' column to keep the table manageable
-        max_details_width = 80
-
-        # Calculate column widths dynamically based on headers and content
-        col_widths = {header: len(header) for header in columns.keys()}
+        col_widths = [len(header) for header in columns.keys()]
+        rows = []
         for result in results_list:
-            for header, key in columns.items():
+            row = []
+            for position, (header, key) in enumerate(columns.items()):
                 value = result.get(key, '')
-                # Format response time for display and width calculation
+                # Format response time for display
                 if key == "elapsed_time_ms":
                     value_str = f"{value:.2f} ms" if isinstance(value, (int, float)) else str(value)
                 else:
                     value_str = str(value)
 
-                if header == "Details":
-                    value_str = value_str[:max_details_width]  # Truncate for width calculation
-                col_widths[header] = max(col_widths[header], len(value_str))
+                if header == "Details" and len(value_str) > max_details_width:
+                    value_str = value_str[:max_details_width - 3] + "..."  # Truncate and add ellipsis
 
-        # Add padding to widths
-        col_padding = 2
-        padded_widths = {header: width + col_padding for header, width in col_widths.items()}
+                row.append(value_str)
+                col_widths[position] = max(col_widths[position], len(value_str))
+            rows.append(row)
 
-        # Print Header Row
-        header_row = "| " + " | ".join(
-            header.ljust(padded_widths[header] - col_padding) for header in columns.keys()) + " |"
-        print(header_row)
+        # One padded template for the header and every row instead of a ljust per cell
+        row_template = "| " + " | ".join(f"{{:<{width}}}" for width in col_widths) + " |"
+        header_row = row_template.format(*columns.keys())
+        separator_line = "|-" + "-|-".join("-" * width for width in col_widths) + "-|"
 
-        # Print Separator Line
-        separator_line = "|-" + "-|-".join(
-            "-" * (padded_widths[header] - col_padding) for header in columns.keys()) + "-|"
-        print(separator_line)
+        lines = [header_row, separator_line]
+        lines.extend(row_template.format(*row) for row in rows)
+        lines.append("-" * len(header_row))  # Match separator length to header row
+        return lines
 
-        # Print Data Rows
-        for result in results_list:
-            row_data = []
-            for header, key in columns.items():
-                value = result.get(key, '')
-                # Format response time for display
-                if key == "elapsed_time_ms":
-                    value_str = f"{value:.2f} ms" if isinstance(value, (int, float)) else str(value)
-                else:
-                    value_str = str(value)
-
-                # Truncate and pad details separately
-                if header == "Details":
-                    if len(value_str) > max_details_width:
-                        value_str = value_str[:max_details_width - 3] + "..."  # Truncate and add ellipsis
-                    row_data.append(value_str.ljust(padded_widths[header] - col_padding))
-                else:
-                    row_data.append(value_str.ljust(padded_widths[header] - col_padding))
-
-            print("| " + " | ".join(row_data) + " |")
-
-        print("-" * len(header_row))  # Match separator length to header row
+    @staticmethod
+    def _write_lines(lines: List[str]) -> None:
+        """Write a block of lines with a single write instead of one print per line"""
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def print_combined_sheet_results(self, sheet_name: str, results: Dict[str, Dict[str, Any]]) -> None:
         """Prints the combined results across multiple cycles for a single sheet."""
@@ -96,7 +83,7 @@ class ConsoleReporter:
             print(f"\nNo test cases with multiple cycles executed in sheet '{sheet_name}'.")
             return
 
-        print(f"\n--- Combined Results for Sheet: {sheet_name} (Multiple Cycles) ---")
+        lines = [f"\n--- Combined Results for Sheet: {sheet_name} (Multiple Cycles) ---"]
 
         # Define columns for statistics output
         columns = OrderedDict([
@@ -132,21 +119,18 @@ class ConsoleReporter:
 
                 col_widths[header] = max(col_widths[header], len(value_str))
 
-        # Add padding to widths
-        col_padding = 2
-        padded_widths = {header: width + col_padding for header, width in col_widths.items()}
+        # One padded template for the header and every row instead of a ljust per cell
+        row_template = "| " + " | ".join(f"{{:<{col_widths[header]}}}" for header in columns.keys()) + " |"
 
-        # Print Header Row
-        header_row = "| " + " | ".join(
-            header.ljust(padded_widths[header] - col_padding) for header in columns.keys()) + " |"
-        print(header_row)
+        # Header Row
+        header_row = row_template.format(*columns.keys())
+        lines.append(header_row)
 
-        # Print Separator Line
-        separator_line = "|-" + "-|-".join(
-            "-" * (padded_widths[header] - col_padding) for header in columns.keys()) + "-|"
-        print(separator_line)
+        # Separator Line
+        separator_line = "|-" + "-|-".join("-" * col_widths[header] for header in columns.keys()) + "-|"
+        lines.append(separator_line)
 
-        # Print Data Rows
+        # Data Rows
         for full_test_name, result in sorted(sheet_results.items()):
             row_data = []
             for header, key in columns.items():
@@ -165,50 +149,33 @@ class ConsoleReporter:
                 if header == "Test Name" and len(value_str) > max_name_width:
                     value_str = value_str[:max_name_width - 3] + "..."
 
-                row_data.append(value_str.ljust(padded_widths[header] - col_padding))
+                row_data.append(value_str)
 
-            print("| " + " | ".join(row_data) + " |")
+            lines.append(row_template.format(*row_data))
 
-        print("-" * len(header_row))  # Match separator length to header row
+        lines.append("-" * len(header_row))  # Match separator length to header row
+        self._write_lines(lines)
 
     def print_summary(self, results: Dict[str, Dict[str, Any]]) -> None:
         """Prints the test execution summary based on results dictionary."""
-        print("\n=== Overall Test Run Summary ===")
         total_attempted = len(results)
-        passed_count = 0
-        failed_count = 0
-        error_count = 0
-        skipped_count = 0
-        unknown_count = 0
 
         if total_attempted == 0:
-            print("No test cases were attempted.")
+            self._write_lines(["\n=== Overall Test Run Summary ===", "No test cases were attempted."])
             return
 
-        # Sort results by sheet and test name for consistent output
-        sorted_test_names = sorted(results.keys())
-
-        for full_test_name in sorted_test_names:
-            result_data = results[full_test_name]
-            status = result_data.get("status", "Unknown")
-
-            if status == "Passed":
-                passed_count += 1
-            elif status == "Failed":
-                failed_count += 1
-            elif status == "Error":
-                error_count += 1
-            elif status == "Skipped":
-                skipped_count += 1
-            else:
-                unknown_count += 1
-
-        print(f"Total Test Cases Attempted: {total_attempted}")
-        print(f"Passed: {passed_count}")
-        print(f"Failed: {failed_count}")
-        print(f"Errors: {error_count}")
-        print(f"Skipped: {skipped_count}")
-        print("-" * 30)
+        # Only the counts are printed, so count statuses in one pass without sorting
+        status_counts = Counter(result_data.get("status", "Unknown") for result_data in results.values())
+
+        self._write_lines([
+            "\n=== Overall Test Run Summary ===",
+            f"Total Test Cases Attempted: {total_attempted}",
+            f"Passed: {status_counts['Passed']}",
+            f"Failed: {status_counts['Failed']}",
+            f"Errors: {status_counts['Error']}",
+            f"Skipped: {status_counts['Skipped']}",
+            "-" * 30,
+        ])
 
     def print_cycle_results(self, sheet_name: str, cycle: int, results_list: List[Dict[str, Any]]) -> None:
         """Prints the results for a specific cycle in a formatted table."""
@@ -216,75 +183,8 @@ class ConsoleReporter:
             print(f"\nNo test cases executed in sheet '{sheet_name}' for cycle {cycle}.")
             return
 
-        print(f"\n--- Results for Sheet: {sheet_name} (Cycle {cycle}) ---")
-
-        # Define columns and their corresponding keys in the result dictionary
-        columns = OrderedDict([
-            ("Test Name", "test_name"),
-            ("Response Time", "elapsed_time_ms"),
-            ("Status", "status"),
-            ("Code", "actual_code"),
-            ("Body Val", "body_validation"),
-            ("Header Val", "header_validation"),
-            ("Details", "details"),
-        ])
-
-        # Define maximum width for the 'Details' column to keep the table manageable
-        max_details_width = 80
-
-        # Calculate column widths dynamically based on headers and content
-        col_widths = {header: len(header) for header in columns.keys()}
-
-        for result in results_list:
-            for header, key in columns.items():
-                value = result.get(key, '')
-                # Format response time for display and width calculation
-                if key == "elapsed_time_ms":
-                    value_str = f"{value:.2f} ms" if isinstance(value, (int, float)) else str(value)
-                else:
-                    value_str = str(value)
-
-                if header == "Details":
-                    value_str = value_str[:max_details_width]  # Truncate for width calculation
-
-                col_widths[header] = max(col_widths[header], len(value_str))
-
-        # Add padding to widths
-        col_padding = 2
-        padded_widths = {header: width + col_padding for header, width in col_widths.items()}
-
-        # Print Header Row
-        header_row = "| " + " | ".join(
-            header.ljust(padded_widths[header] - col_padding) for header in columns.keys()) + " |"
-        print(header_row)
-
-        # Print Separator Line
-        separator_line = "|-" + "-|-".join(
-            "-" * (padded_widths[header] - col_padding) for header in columns.keys()) + "-|"
-        print(separator_line)
-
-        # Print Data Rows
-        for result in results_list:
-            row_data = []
-            for header, key in columns.items():
-                value = result.get(key, '')
-                # Format response time for display
-                if key == "elapsed_time_ms":
-                    value_str = f"{value:.2f} ms" if isinstance(value, (int, float)) else str(value)
-                else:
-                    value_str = str(value)
-
-                # Truncate and pad details separately
-                if header == "Details":
-                    if len(value_str) > max_details_width:
-                        value_str = value_str[:max_details_width - 3] + "..."  # Truncate and add ellipsis
-                    row_data.append(value_str.ljust(padded_widths[header] - col_padding))
-                else:
-                    row_data.append(value_str.ljust(padded_widths[header] - col_padding))
-
-            print("| " + " | ".join(row_data) + " |")
-
-        print("-" * len(header_row))  # Match separator length to header row
+        self._write_lines([f"\n--- Results for Sheet: {sheet_name} (Cycle {cycle}) ---"] +
+                          self._format_results_table(results_list))
 
 
 class PDFReporter:
@@ -296,6 +196,12 @@ class PDFReporter:
                         program_name: str = "API Test Runner") -> None:
         """Generates a PDF report of the test results with per-sheet insights,
            failed/errored tests, and slowest tests."""
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         elements = []
         styles = getSampleStyleSheet()
@@ -345,25 +251,11 @@ class PDFReporter:
         # --- Overall Summary ---
         elements.append(Paragraph("Overall Test Run Summary", styles['Heading1']))
         total_attempted_overall = len(results)
-        passed_count_overall = 0
-        failed_count_overall = 0
-        error_count_overall = 0
-        skipped_count_overall = 0
-
-        for result_data in results.values():
-            status = result_data.get("status", "Unknown")
-            if status == "Passed":
-                passed_count_overall += 1
-            elif status == "Failed":
-                failed_count_overall += 1
-            elif status == "Error":
-                error_count_overall += 1
-            elif status == "Skipped":
-                skipped_count_overall += 1
+        counts_overall = Counter(result_data.get("status", "Unknown") for result_data in results.values())
 
         summary_data_overall = [['Total Attempted', 'Passed', 'Failed', 'Errors', 'Skipped'],
-                                [total_attempted_overall, passed_count_overall, failed_count_overall,
-                                 error_count_overall, skipped_count_overall]]
+                                [total_attempted_overall, counts_overall['Passed'], counts_overall['Failed'],
+                                 counts_overall['Error'], counts_overall['Skipped']]]
 
         summary_table_style = [
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
@@ -400,25 +292,12 @@ class PDFReporter:
             elements.append(Spacer(1, 0.25 * inch))
 
             # Add Sheet Summary
-            passed_count = 0
-            failed_count = 0
-            error_count = 0
-            skipped_count = 0
-
-            for _, result_data in sheet_results_list:
-                status = result_data.get("status", "Unknown")
-                if status == "Passed":
-                    passed_count += 1
-                elif status == "Failed":
-                    failed_count += 1
-                elif status == "Error":
-                    error_count += 1
-                elif status == "Skipped":
-                    skipped_count += 1
+            counts = Counter(result_data.get("status", "Unknown") for _, result_data in sheet_results_list)
 
             total_count = len(sheet_results_list)
             elements.append(Paragraph(
-                f"Test Cases: {total_count} | Passed: {passed_count} | Failed: {failed_count} | Errors: {error_count} | Skipped: {skipped_count}",
+                f"Test Cases: {total_count} | Passed: {counts['Passed']} | Failed: {counts['Failed']} | "
+                f"Errors: {counts['Error']} | Skipped: {counts['Skipped']}",
                 styles['Normal']))
             elements.append(Spacer(1, 0.2 * inch))
 
@@ -684,6 +563,10 @@ class PDFReporter:
 
     def add_cycle_results_section(self, elements, styles, sheet_name, cycle_results_by_cycle):
         """Adds a section for individual cycle results to the PDF report."""
+        from reportlab.platypus import Table, Paragraph, Spacer
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+
         elements.append(Paragraph("Individual Cycle Results", styles['Heading3']))
         elements.append(Spacer(1, 0.1 * inch))
 
@@ -1,16 +1,43 @@
-import re
+import ast
 import json
-import pandas as pd
-from typing import Dict, List, Any, Union
+import re
+from functools import lru_cache
+from types import CodeType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+import json_utils
+from parsers import RequestParser, isna
 
 
 class Validator:
     """Handles validation of API responses and executing actions"""
 
-    def __init__(self, environment_vars: Dict[str, str]):
+    # Compiled once instead of on every call; conditions and actions are evaluated per test case
+    _ARRAY_INDEX_RE = re.compile(r'([a-zA-Z0-9_]+)\[(\d+)\]$')
+    _RESULT_RE = re.compile(r'result\.([a-zA-Z0-9_\[\].]+)')
+    _ACTION_SPLIT_RE = re.compile(r'[;\n]')
+    _ACTION_ASSIGN_RE = re.compile(r'\$([a-zA-Z0-9_]+)\s*=\s*result\.([a-zA-Z0-9_\[\].]+)')
+
+    # Syntax allowed in conditions: any plain expression (literals, names, calls, operators,
+    # conditional expressions, subscripts, f-strings, comprehensions and lambdas). Only
+    # attribute access, the route out of an eval sandbox without builtins, is rejected.
+    _CONDITION_NODES = (
+        ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd, ast.Invert,
+        ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+        ast.BitAnd, ast.BitOr, ast.BitXor, ast.LShift, ast.RShift,
+        ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot, ast.In, ast.NotIn,
+        ast.IfExp, ast.Call, ast.keyword, ast.Name, ast.Load, ast.Store, ast.Constant, ast.Starred,
+        ast.List, ast.Tuple, ast.Set, ast.Dict, ast.Subscript, ast.Slice, ast.JoinedStr, ast.FormattedValue,
+        ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.comprehension,
+        ast.Lambda, ast.arguments, ast.arg,
+    )
+
+    def __init__(self, environment_vars: Dict[str, str], parser: Optional[RequestParser] = None):
         self.environment_vars = environment_vars
+        # Variable substitution is shared with the request parser so both see the same names
+        self.parser = parser or RequestParser(environment_vars)
 
-    def validate_response(self, test_case: pd.Series, api_result_data: Dict[str, Any],
+    def validate_response(self, test_case: Dict[str, Any], api_result_data: Dict[str, Any],
                           verbose: bool) -> Dict[str, Any]:
         """Validate API response against expected values"""
         validation_result = {
@@ -22,7 +49,7 @@ class Validator:
 
         # Validate response code
         expected_code = test_case.get('expect_response_code', None)
-        if pd.notna(expected_code):
+        if not isna(expected_code):
             try:
                 expected_code = int(expected_code)
                 if api_result_data["code"] != expected_code:
@@ -36,7 +63,7 @@ class Validator:
 
         # Validate response body
         expected_body = test_case.get('expect_response_body', None)
-        if pd.notna(expected_body):
+        if not isna(expected_body):
             if not self.evaluate_condition(expected_body, api_result_data, verbose):
                 validation_result["body_validation"] = "Failed"
                 validation_result["details"] += f"Body Validation Failed ('{expected_body}'). "
@@ -46,7 +73,7 @@ class Validator:
 
         # Validate response headers
         expected_headers = test_case.get('expect_response_header', None)
-        if pd.notna(expected_headers):
+        if not isna(expected_headers):
             if not self.evaluate_condition(expected_headers, api_result_data, verbose):
                 validation_result["header_validation"] = "Failed"
                 validation_result["details"] += f"Header Validation Failed ('{expected_headers}'). "
@@ -58,7 +85,7 @@ class Validator:
 
     def _get_nested_value(self, obj: Any, path: str) -> Any:
         """
-        Traverse an object (dict or list) using a dot-notation path
+        Traverse an object (mapping or list) using a dot-notation path
         including array indexing like 'key.list[index].nested_key'.
         Returns None if any part of the path is invalid or not found.
         """
@@ -67,62 +94,64 @@ class Validator:
 
         current_value = obj
 
-        segments = path.split('.')
-        for segment in segments:
+        for kind, name, index in self._compile_path(path):
             if current_value is None:
                 return None
 
-            array_match = re.match(r'([a-zA-Z0-9_]+)\[(\d+)\]$', segment)
-
-            if array_match:
-                key_name = array_match.group(1)
-                try:
-                    index = int(array_match.group(2))
-                except ValueError:
-                    print(f"Warning: Invalid array index format in path segment '{segment}'")
-                    return None
-
-                if isinstance(current_value, dict) and key_name in current_value:
-                    list_obj = current_value.get(key_name)
-                    if isinstance(list_obj, list):
-                        if 0 <= index < len(list_obj):
-                            current_value = list_obj[index]
-                        else:
-                            return None
-                    else:
-                        return None
+            if kind == 'key':
+                if isinstance(current_value, Mapping) and name in current_value:
+                    current_value = current_value.get(name)
+                elif isinstance(current_value, list) and name == 'length':  # Basic list length access
+                    current_value = len(current_value)
                 else:
                     return None
-            elif segment.isdigit():
-                try:
-                    index = int(segment)
-                    if isinstance(current_value, list):
-                        if 0 <= index < len(current_value):
-                            current_value = current_value[index]
-                        else:
-                            return None
+            elif kind == 'item':  # key[index]
+                if isinstance(current_value, Mapping) and name in current_value:
+                    list_obj = current_value.get(name)
+                    if isinstance(list_obj, list) and 0 <= index < len(list_obj):
+                        current_value = list_obj[index]
                     else:
                         return None
-                except ValueError:
+                else:
                     return None
-            else:
-                if isinstance(current_value, dict) and segment in current_value:
-                    current_value = current_value.get(segment)
-                elif isinstance(current_value, list) and segment == 'length':  # Basic list length access
-                    current_value = len(current_value) if isinstance(current_value, list) else None
-                    if current_value is None:
-                        return None
+            elif kind == 'index':
+                if isinstance(current_value, list) and 0 <= index < len(current_value):
+                    current_value = current_value[index]
                 else:
                     return None
+            else:
+                return None
 
         return current_value
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _compile_path(path: str) -> Tuple[Tuple[str, Optional[str], Optional[int]], ...]:
+        """
+        Split a path into (kind, name, index) steps once per distinct path, so lookups
+        repeated for every row and cycle skip the split and regex matching.
+        kind is 'key' (name), 'item' (name[index]), 'index' (a bare list index) or 'invalid'.
+        """
+        steps = []
+        for segment in path.split('.'):
+            array_match = Validator._ARRAY_INDEX_RE.match(segment)
+            try:
+                if array_match:
+                    steps.append(('item', array_match.group(1), int(array_match.group(2))))
+                elif segment.isdigit():
+                    steps.append(('index', None, int(segment)))
+                else:
+                    steps.append(('key', segment, None))
+            except ValueError:
+                steps.append(('invalid', None, None))
+        return tuple(steps)
+
     def evaluate_condition(self, condition: str, result: Dict[str, Any], verbose: bool) -> bool:
         """Evaluate a condition against the result"""
-        if not condition or pd.isna(condition):
+        if isna(condition) or not condition:
             return True
 
-        condition = self._replace_env_vars(str(condition))
+        condition = self.parser.replace_env_vars(str(condition))
 
         def contains(data, value):
             data_str = str(data) if data is not None else ""
@@ -176,27 +205,25 @@ class Validator:
         null = None
 
         try:
-            pattern = r'result\.([a-zA-Z0-9_\[\].]+)'
-
-            def replace_result_ref(match):
-                path = match.group(1)
-                value = self._get_nested_value(result, path)
-
-                if isinstance(value, (dict, list)):
-                    return json.dumps(value, ensure_ascii=False)
-                elif isinstance(value, str):
-                    return repr(value)
-                elif value is None:
-                    return 'None'
-                elif isinstance(value, bool):
-                    return str(value)
-                else:
-                    return repr(value)
-
-            eval_condition = re.sub(pattern, replace_result_ref, condition)
+            code, paths = self._compile_condition(condition)
 
             if verbose:
-                print(f"  Evaluating condition string: {eval_condition}")
+                def replace_result_ref(match):
+                    path = match.group(1)
+                    value = self._get_nested_value(result, path)
+
+                    if isinstance(value, (Mapping, list)):
+                        return json_utils.dumps(value, default=dict)
+                    elif isinstance(value, str):
+                        return repr(value)
+                    elif value is None:
+                        return 'None'
+                    elif isinstance(value, bool):
+                        return str(value)
+                    else:
+                        return repr(value)
+
+                print(f"  Evaluating condition string: {self._RESULT_RE.sub(replace_result_ref, condition)}")
 
             context = {
                 'contains': contains,
@@ -209,7 +236,11 @@ class Validator:
                 'null': None,
             }
 
-            eval_result = eval(eval_condition, {"__builtins__": {}}, context)
+            # Bind each referenced value to its placeholder name
+            for index, path in enumerate(paths):
+                context[f'__v{index}'] = self._get_nested_value(result, path)
+
+            eval_result = eval(code, {"__builtins__": {}}, context)
 
             if verbose:
                 print(f"  Condition '{condition}' evaluated to: {eval_result}")
@@ -220,32 +251,41 @@ class Validator:
             print(f"Error evaluating condition '{condition}': {e}")
             return False
 
-    def _replace_env_vars(self, text: Union[str, Any]) -> Union[str, Any]:
-        """Replace environment variables in text with their values"""
-        if not isinstance(text, str):
-            return text
-
-        pattern = r'\$([a-zA-Z0-9_]+)'
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _compile_condition(condition: str) -> Tuple[CodeType, Tuple[str, ...]]:
+        """
+        Compile a condition once and cache it by its source. Each 'result.<path>' reference
+        is rewritten to a '__v<n>' name that is bound to the resolved value at evaluation
+        time, instead of splicing repr'd values into the source and reparsing it every run.
+        Raises ValueError for syntax outside the condition language (see _CONDITION_NODES).
+        """
+        paths = []
 
-        def replace_var(match):
-            var_name = match.group(1)
-            if var_name in self.environment_vars:
-                return self.environment_vars[var_name]
-            else:
-                return match.group(0)  # Return original string if not found
+        def to_lookup(match):
+            paths.append(match.group(1))
+            return f"__v{len(paths) - 1}"
 
-        return re.sub(pattern, replace_var, text)
+        source = Validator._RESULT_RE.sub(to_lookup, condition) if 'result.' in condition else condition
+        tree = ast.parse(source, '<condition>', 'eval')
+        for node in ast.walk(tree):
+            if not isinstance(node, Validator._CONDITION_NODES):
+                raise ValueError(f"unsupported syntax '{type(node).__name__}' in condition")
+        return compile(tree, '<condition>', 'eval'), tuple(paths)
 
     def execute_action(self, action: str, result: Dict[str, Any]) -> None:
         """Execute an action, such as setting an environment variable"""
-        if not action or pd.isna(action):
+        if isna(action) or not action:
+            return
+
+        action = str(action)
+        if '$' not in action or 'result.' not in action:  # Nothing an assignment could match
             return
 
-        actions = [act.strip() for act in re.split(r'[;\n]', str(action)) if act.strip()]
+        actions = [act.strip() for act in self._ACTION_SPLIT_RE.split(action) if act.strip()]
 
         for single_action in actions:
-            pattern = re.compile(r'\$([a-zA-Z0-9_]+)\s*=\s*result\.([a-zA-Z0-9_\[\].]+)')
-            match = pattern.search(single_action)
+            match = self._ACTION_ASSIGN_RE.search(single_action)
 
             if match:
                 var_name, result_path = match.groups()
@@ -253,8 +293,10 @@ class Validator:
                     value = self._get_nested_value(result, result_path)
 
                     if value is not None:
-                        if isinstance(value, (dict, list)):
-                            value_str = json.dumps(value, ensure_ascii=False)
+                        if isinstance(value, (Mapping, list)):
+                            # Kept on json.dumps: the text is substituted verbatim into URLs,
+                            # headers and bodies, so its layout must not change
+                            value_str = json.dumps(value, ensure_ascii=False, default=dict)
                         elif isinstance(value, bool):
                             value_str = str(value).lower()
                         elif value is None:
@@ -262,7 +304,10 @@ class Validator:
                         else:
                             value_str = str(value)
 
+                        is_new_name = var_name not in self.environment_vars
                         self.environment_vars[var_name] = value_str
+                        if is_new_name:  # Only once the name is there to be picked up
+                            self.parser.mark_env_changed()
 
                 except Exception as e:
                     print(f"Error executing action '{single_action}': {e}")
\ No newline at end of file